@@ -1,22 +1,55 @@
 import os
 import time
 import json
+import atexit
+import functools
+import queue
+import random
 from typing import List, Optional, Dict, Any
 from selenium import webdriver
 from selenium.webdriver.chrome.service import Service
 from selenium.webdriver.chrome.options import Options
-from selenium.webdriver.common.by import By
 from selenium.webdriver.support.ui import WebDriverWait
 from selenium.webdriver.support import expected_conditions as EC
 from selenium.common.exceptions import TimeoutException, WebDriverException, NoSuchElementException
-import google.generativeai as genai
 from pathlib import Path
 import logging
+import multiprocessing
 from dotenv import load_dotenv
 import base64
 import hashlib
+import io
 import re
-from PIL import Image
+import threading
+from collections import OrderedDict, deque
+from concurrent.futures import ProcessPoolExecutor, ThreadPoolExecutor
+from urllib.parse import urlsplit
+
+# orjson is optional; it parses and serializes several times faster than the stdlib
+try:
+    import orjson
+    
+    _json_loads = orjson.loads
+    
+    def _json_dumps(obj: Any) -> str:
+        return orjson.dumps(obj).decode('utf-8')
+        
+except ImportError:
+    _json_loads = json.loads
+    
+    def _json_dumps(obj: Any) -> str:
+        return json.dumps(obj, separators=(',', ':'), ensure_ascii=False)
+
+# xxhash is optional; xxh3 is much faster than blake2b for non-cryptographic fingerprints
+try:
+    import xxhash
+    
+    def _fingerprint(data: bytes) -> str:
+        return xxhash.xxh3_64_hexdigest(data)
+        
+except ImportError:
+    def _fingerprint(data: bytes) -> str:
+        return hashlib.blake2b(data, digest_size=8).hexdigest()
 
 load_dotenv()
 
@@ -28,7 +61,8 @@ logger = logging.getLogger(__name__)
 SYSTEM_PROMPT = """You are an expert web testing automation assistant. Your primary goal is to complete the given task efficiently and provide clear results.
 
 Available actions:
-1. "javascript" - Execute JavaScript code to interact with the page
+1. "javascript" - Execute JavaScript code to interact with the page ("javascript": code), or a short
+   sequence of related actions ("steps": [code, ...]; a step may be {"javascript": code, "continue_on_error": true})
 2. "wait" - Wait for page elements to load or change (1-5 seconds)
 3. "end" - End the test with analysis report when task is complete
 
@@ -43,6 +77,7 @@ JavaScript Helper Functions Available:
 Guidelines for SUCCESS:
 - Be decisive and focused on the main task
 - Use specific CSS selectors (prefer id, class, data attributes)
+- Chain closely related actions (e.g. fill several fields, then submit) as up to 5 "steps" in one response
 - Check if task is completed after each action
 - If you find the information or complete the goal, immediately use "end" action
 - Handle popups, cookies banners, and modals first
@@ -53,12 +88,426 @@ Response must be valid JSON with "action" field and appropriate additional field
 
 CRITICAL: End the test immediately when the main objective is achieved or sufficient information is gathered."""
 
+# Fixed head of the initial prompt; only the task and page details are interpolated per run
+_PROMPT_HEADER = SYSTEM_PROMPT + "\n\nTASK: "
+
+# Steps run per javascript action; SYSTEM_PROMPT advertises the same limit
+MAX_JS_STEPS = 5
+
+# Markdown code fences around JSON responses
+_FENCE_RE = re.compile(r'^\s*```(?:json)?\s*|\s*```\s*$', re.IGNORECASE)
+
+# Decoder for extracting a JSON action embedded in free-form responses
+_JSON_DECODER = json.JSONDecoder()
+
+# Keywords for interpreting free-text responses, matched against the set of words in the response
+_WORD_RE = re.compile(r'[a-z]+')
+END_KEYWORDS = frozenset({'complete', 'completed', 'finished', 'done', 'success', 'successful', 'successfully'})
+END_PHRASES = frozenset({'found the', 'task accomplished', 'objective achieved'})
+JS_KEYWORDS = frozenset({
+    'click', 'clicks', 'clicking', 'clicked',
+    'fill', 'fills', 'filling', 'filled',
+    'submit', 'submits', 'submitting', 'submitted'
+})
+JS_CALL_HINTS = frozenset({'click(', 'fill('})  # Also matches helper calls such as quickClick(
+WAIT_KEYWORDS = frozenset({'wait', 'waits', 'waiting', 'waited', 'loading'})
+
+# Multi-word phrases and call syntax that word matching cannot see, found in a single scan
+_HINT_RE = re.compile('|'.join(re.escape(hint) for hint in sorted(END_PHRASES | JS_CALL_HINTS)))
+
+# URL patterns blocked via CDP to cut page-load time
+BLOCKED_TRACKER_URLS = [
+    "*google-analytics.com*",
+    "*googletagmanager.com*",
+    "*doubleclick.net*",
+    "*googlesyndication.com*",
+    "*facebook.net*",
+    "*hotjar.com*"
+]
+
+# Heavy static resources, additionally blocked when block_resources is enabled
+BLOCKED_RESOURCE_URLS = [
+    "*.png", "*.jpg", "*.jpeg", "*.webp", "*.gif", "*.svg",
+    "*.mp4", "*.webm",
+    "*.woff", "*.woff2", "*.ttf",
+    "*.css"
+]
+
+# Collects all page info in the browser so get_enhanced_page_info needs a single
+# WebDriver round-trip; called with (selectors_map, per_type_limit)
+_COLLECT_PAGE_INFO_JS = """
+    function describeElement(el, type, index) {
+        const info = {
+            type: type,
+            index: index,
+            tag: el.tagName.toLowerCase(),
+            id: el.getAttribute("id") || "",  // el.id is shadowed on forms by a child named "id"
+            class: el.getAttribute("class") || "",
+            text: (el.innerText || "").trim().slice(0, 100),
+            visible: true,
+            enabled: !el.disabled
+        };
+        
+        // Add specific attributes
+        switch (type) {
+            case "input":
+                info.input_type = el.getAttribute("type") || "text";
+                info.name = el.getAttribute("name") || "";
+                info.placeholder = el.getAttribute("placeholder") || "";
+                info.value = el.value || "";
+                break;
+            case "link":
+                // getAttribute works for SVG links too, whose href is an SVGAnimatedString
+                info.href = el.getAttribute("href") || "";
+                try {
+                    info.href = new URL(info.href, document.baseURI).href;
+                } catch (e) {}  // Keep an unparsable href as written
+                info.href = info.href.slice(0, 100);  // Truncate long URLs
+                break;
+            case "form":
+                info.action = el.getAttribute("action") || "";
+                info.method = (el.getAttribute("method") || "GET").toUpperCase();
+                break;
+            case "button":
+                info.onclick = el.getAttribute("onclick") || "";
+                break;
+        }
+        
+        return info;
+    }
+    
+    function collectPageInfo(selectorsMap, limit, maxElements) {
+        const types = Object.keys(selectorsMap);
+        const buckets = {};
+        const seen = {};
+        const position = {};
+        types.forEach(type => { buckets[type] = []; seen[type] = 0; position[type] = 0; });
+        
+        // Walk the DOM once with the combined selector and classify each element
+        const candidates = document.querySelectorAll(Object.values(selectorsMap).join(", "));
+        for (const el of candidates) {
+            for (const type of types) {
+                if (seen[type] >= limit || !el.matches(selectorsMap[type])) continue;
+                const index = position[type]++;
+                
+                // Filter invisible elements before they count towards the limit
+                if (el.offsetParent === null) continue;
+                seen[type]++;
+                
+                buckets[type].push([el, type, index]);
+            }
+            
+            // Stop early once every type has reached its limit
+            if (types.every(type => seen[type] >= limit)) break;
+        }
+        
+        // Keep elements grouped by type in selectorsMap order; only the ones that are
+        // returned are described, since reading innerText forces layout
+        const matched = [].concat(...types.map(type => buckets[type]));
+        const elements = [];
+        for (const args of matched.slice(0, maxElements)) {
+            // Skip an element that cannot be described rather than failing the whole snapshot
+            try {
+                elements.push(describeElement(...args));
+            } catch (e) {}
+        }
+        
+        // Get any error messages or alerts
+        const alerts = Array.from(document.querySelectorAll(".alert, .error, .warning, [role='alert']"))
+            .slice(0, 3)
+            .filter(el => el.offsetParent !== null)
+            .map(el => (el.innerText || "").trim().slice(0, 200));
+        
+        return {
+            url: location.href,
+            title: document.title,
+            ready_state: document.readyState,
+            interactive_elements: elements,
+            interactive_count: matched.length,
+            alerts: alerts
+        };
+    }
+    
+    return collectPageInfo(arguments[0], arguments[1], arguments[2]);
+"""
+
+# Page state fingerprint inputs: url, title, ready state, structural element counts and visible
+# alert text, so a revisited or reloaded page that looks the same hashes the same. A MutationObserver
+# on childList changes marks the counts dirty, so they are only re-measured after the DOM structure
+# changed; attribute and text updates (clocks, carousels) never count as a new state. The observer
+# is installed on first use in each document, which also covers documents replaced by navigation.
+_PAGE_STATE_JS = """
+    if (window.__domVersion === undefined) {
+        window.__domVersion = 0;
+        new MutationObserver(() => { window.__domVersion++; })
+            .observe(document, {subtree: true, childList: true});
+    }
+    if (window.__countsVersion !== window.__domVersion || !window.__domCounts) {
+        window.__domCounts = [
+            document.forms.length,
+            document.querySelectorAll("input:not([type='hidden'])").length,
+            document.querySelectorAll("button, input[type='button'], input[type='submit']").length,
+            document.querySelectorAll("a[href]").length
+        ];
+        window.__countsVersion = window.__domVersion;
+    }
+    const alerts = Array.from(document.querySelectorAll(".alert, .error, .warning, [role='alert']"))
+        .filter(el => el.offsetParent !== null)
+        .map(el => (el.textContent || "").trim().slice(0, 100))
+        .join("|");
+    return [location.href, document.title, document.readyState, ...window.__domCounts, alerts];
+"""
+
+# Enhanced JavaScript wrapper with helper functions; user code is inserted between
+# the prefix and suffix by _wrap_javascript
+_JS_PREFIX = """
+    try {
+        // Count DOM mutations caused by the action so Python can wait for them to settle
+        window.__mutCount = 0;
+        if (!window.__mutObserver && document.documentElement) {
+            window.__mutObserver = new MutationObserver(() => { window.__mutCount++; });
+            window.__mutObserver.observe(document.documentElement, {subtree: true, childList: true, attributes: true});
+        }
+        
+        // Helper functions
+        function quickClick(selector) {
+            const elements = typeof selector === 'string' ? document.querySelectorAll(selector) : [selector];
+            for (let el of elements) {
+                if (el && el.offsetParent !== null) { // Check if visible
+                    el.scrollIntoView({behavior: 'smooth', block: 'center'});
+                    setTimeout(() => {
+                        el.click();
+                    }, 100);
+                    return 'Clicked element: ' + (el.id || el.className || el.tagName);
+                }
+            }
+            throw new Error('No visible element found for: ' + selector);
+        }
+        
+        function quickFill(selector, value) {
+            const el = document.querySelector(selector);
+            if (!el) throw new Error('Input not found: ' + selector);
+            
+            el.scrollIntoView({behavior: 'smooth', block: 'center'});
+            el.focus();
+            
+            // Clear existing value
+            el.value = '';
+            
+            // Set new value
+            el.value = value;
+            
+            // Trigger events
+            el.dispatchEvent(new Event('input', {bubbles: true, cancelable: true}));
+            el.dispatchEvent(new Event('change', {bubbles: true, cancelable: true}));
+            el.dispatchEvent(new Event('keyup', {bubbles: true, cancelable: true}));
+            
+            return 'Filled input: ' + (el.name || el.id || selector) + ' with: ' + value;
+        }
+        
+        function quickSubmit(formSelector) {
+            const form = document.querySelector(formSelector);
+            if (!form) throw new Error('Form not found: ' + formSelector);
+            
+            form.scrollIntoView({behavior: 'smooth', block: 'center'});
+            
+            // Try clicking submit button first
+            const submitBtn = form.querySelector('button[type="submit"], input[type="submit"], button:not([type])');
+            if (submitBtn && submitBtn.offsetParent !== null) {
+                submitBtn.click();
+                return 'Submitted form by clicking submit button';
+            } else {
+                form.submit();
+                return 'Submitted form directly';
+            }
+        }
+        
+        function findElements(selector) {
+            const elements = document.querySelectorAll(selector);
+            return Array.from(elements).map((el, i) => ({
+                index: i,
+                tag: el.tagName,
+                id: el.id,
+                className: el.className,
+                text: el.textContent.trim().substring(0, 100),
+                visible: el.offsetParent !== null
+            }));
+        }
+        
+        function scrollToElement(selector) {
+            const el = document.querySelector(selector);
+            if (!el) throw new Error('Element not found: ' + selector);
+            el.scrollIntoView({behavior: 'smooth', block: 'center'});
+            return 'Scrolled to element: ' + selector;
+        }
+        
+        function getCurrentInfo() {
+            return {
+                url: window.location.href,
+                title: document.title,
+                readyState: document.readyState,
+                activeElement: document.activeElement ? {
+                    tag: document.activeElement.tagName,
+                    id: document.activeElement.id,
+                    className: document.activeElement.className
+                } : null,
+                hasPopups: !!(document.querySelector('.modal, .popup, .overlay, [role="dialog"]')),
+                alerts: Array.from(document.querySelectorAll('.alert, .error, .warning, [role="alert"]')).map(el => el.textContent.trim())
+            };
+        }
+        
+        function dismissPopups() {
+            const selectors = [
+                '.modal .close, .popup .close, .overlay .close',
+                '[role="dialog"] button[aria-label*="close"]',
+                '.cookie-banner button, .cookies-accept, .accept-cookies',
+                '.newsletter-popup .close, .newsletter-modal .close',
+                '.modal-backdrop, .overlay-backdrop',
+                'button[data-dismiss="modal"]'
+            ];
+            
+            for (let selector of selectors) {
+                const elements = document.querySelectorAll(selector);
+                for (let el of elements) {
+                    if (el.offsetParent !== null) {
+                        el.click();
+                        return 'Dismissed popup/modal';
+                    }
+                }
+            }
+            
+            // Try ESC key
+            document.dispatchEvent(new KeyboardEvent('keydown', {key: 'Escape', keyCode: 27}));
+            return 'Attempted to dismiss popups with ESC';
+        }
+        
+        // Execute user code
+        const result = (function() {
+            """
+
+_JS_SUFFIX = """
+        })();
+        
+        return result || "JavaScript executed successfully";
+        
+    } catch (error) {
+        console.error('JavaScript execution error:', error);
+        return "Error: " + error.toString();
+    }
+    """
+
+@functools.lru_cache(maxsize=64)
+def _wrap_javascript(js_code: str) -> str:
+    """Wrap user JavaScript with the helper functions, memoized for repeated code."""
+    return _JS_PREFIX + js_code + _JS_SUFFIX
+
+# Chrome launch configuration, built once at import instead of on every setup_selenium call
+CHROME_ARGUMENTS = [
+    "--no-sandbox",
+    "--disable-dev-shm-usage",
+    "--disable-blink-features=AutomationControlled",
+    "--disable-extensions",
+    "--disable-gpu",
+    "--disable-web-security",
+    "--disable-features=TranslateUI",
+    "--disable-ipc-flooding-protection",
+    "--no-first-run",
+    "--no-service-autorun",
+    "--password-store=basic",
+    "--use-mock-keychain",
+    "--disable-background-networking",
+    "--disable-default-apps",
+    "--disable-sync",
+    "--metrics-recording-only",
+    "--no-default-browser-check",
+    "--no-pings",
+    "--disable-notifications",
+    "--aggressive-cache-discard",
+    "--memory-pressure-off"
+]
+
+CHROME_PREFS = {
+    "credentials_enable_service": False,
+    "profile.password_manager_enabled": False,
+    "profile.default_content_setting_values.notifications": 2,
+    "profile.default_content_settings.popups": 0,
+    "profile.managed_default_content_settings.images": 1,  # Allow images for better analysis
+    "profile.default_content_setting_values.plugins": 1,
+    "profile.default_content_setting_values.geolocation": 2,
+    "profile.default_content_setting_values.media_stream": 2,
+    "profile.managed_default_content_settings.media_stream": 2
+}
+
+
+def _build_options(headless: bool = False) -> Options:
+    """Build Chrome options from the shared launch configuration."""
+    chrome_options = Options()
+    if headless:
+        chrome_options.add_argument("--headless=new")  # Use new headless mode
+    
+    for argument in CHROME_ARGUMENTS:
+        chrome_options.add_argument(argument)
+    
+    chrome_options.add_experimental_option("excludeSwitches", ["enable-automation", "enable-logging"])
+    chrome_options.add_experimental_option('useAutomationExtension', False)
+    chrome_options.add_experimental_option("prefs", dict(CHROME_PREFS))
+    
+    # Return from driver.get on DOMContentLoaded instead of the full load event
+    chrome_options.page_load_strategy = 'eager'
+    return chrome_options
+
+
+class DriverPool:
+    """Warm WebDriver instances kept for reuse, keyed by the options they were launched with."""
+    
+    def __init__(self):
+        self._pools: Dict[int, queue.Queue] = {}
+        self._lock = threading.Lock()
+    
+    def _queue_for(self, opts_key: int) -> queue.Queue:
+        with self._lock:
+            return self._pools.setdefault(opts_key, queue.Queue())
+    
+    def acquire(self, opts_key: int) -> Optional[webdriver.Chrome]:
+        """Return an idle driver launched with matching options, or None."""
+        try:
+            return self._queue_for(opts_key).get_nowait()
+        except queue.Empty:
+            return None
+    
+    def release(self, driver: webdriver.Chrome, opts_key: int):
+        """Return a reset driver to the pool."""
+        self._queue_for(opts_key).put(driver)
+    
+    def shutdown(self):
+        """Quit all idle drivers."""
+        with self._lock:
+            pools = list(self._pools.values())
+        
+        for pool in pools:
+            while True:
+                try:
+                    driver = pool.get_nowait()
+                except queue.Empty:
+                    break
+                
+                try:
+                    driver.quit()
+                except Exception as e:
+                    logger.warning(f"Error closing pooled WebDriver: {e}")
+
+_driver_pool = DriverPool()
+
 class EnhancedWebTestingAutomation:
-    def __init__(self, gemini_api_key: str, chrome_driver_path: Optional[str] = None):
+    def __init__(self, gemini_api_key: str, chrome_driver_path: Optional[str] = None, save_screenshots: bool = True,
+                 screenshots_dir: str = "test_screenshots", block_resources: bool = False):
         """Initialize the Enhanced Web Testing Automation system."""
         try:
-            # Configure Gemini with better error handling
-            genai.configure(api_key=gemini_api_key)
+            # Imported lazily; the SDK is slow to import and only needed once an instance exists
+            import google.generativeai as genai
+            
+            # Configure Gemini with better error handling; the gRPC channel is shared by all calls
+            genai.configure(api_key=gemini_api_key, transport="grpc")
             self.model = genai.GenerativeModel(
                 'gemini-1.5-pro',
                 generation_config=genai.types.GenerationConfig(
@@ -67,22 +516,58 @@ class EnhancedWebTestingAutomation:
                 )
             )
             
+            # Per-call generation settings, built once and reused for every request
+            self.api_generation_config = genai.types.GenerationConfig(
+                temperature=0.1,
+                max_output_tokens=1500
+            )
+            
             self.driver = None
+            self._driver_key = None  # DriverPool key for the options self.driver was launched with
             self.wait = None
-            self.conversation_history = []
+            self.task_message = None  # Initial task prompt, always sent ahead of the history window
+            self.conversation_history = deque(maxlen=5)  # Sliding window; bounded so old screenshots are released
             self.screenshot_count = 0
-            self.screenshots_dir = Path("test_screenshots")
-            self.screenshots_dir.mkdir(exist_ok=True)
+            self.screenshots_dir = Path(screenshots_dir)
+            self.screenshots_dir.mkdir(parents=True, exist_ok=True)
             self.chrome_driver_path = chrome_driver_path
+            self.save_screenshots = save_screenshots
+            self.block_resources = block_resources  # Faster loads, but screenshots lose images and styling
             
             # Enhanced optimization flags
-            self.page_state_cache = {}
+            self.page_state_cache = OrderedDict()  # state hash -> page info (LRU)
+            self.max_page_state_cache_size = 32
             self.last_page_hash = None
+            self._visited_origins = set()  # Origins whose storage cleanup clears before pooling the driver
+            self._last_dom_state = None  # Fingerprint inputs behind _last_dom_hash
+            self._last_dom_hash = None
             self.consecutive_same_state_count = 0
             self.max_same_state_count = 2  # Reduced for faster detection
             self.successful_actions = 0
             self.failed_actions = 0
-            self.start_time = time.time()
+            self.start_time = time.monotonic()
+            
+            # Base64 cache for screenshots, keyed by (path, size, mtime)
+            self._b64_cache = OrderedDict()
+            self.max_b64_cache_size = 16
+            
+            # Model responses keyed by a hash of the exact request content (LRU with TTL)
+            self._vision_cache = OrderedDict()
+            self.max_vision_cache_size = 100
+            self.vision_cache_ttl = 600  # seconds
+            
+            # Parsed AI decisions keyed by (page state hash, task hash), replayed once on a revisit (LRU)
+            self._decision_cache = OrderedDict()
+            self.max_decision_cache_size = 32
+            
+            # Worker pool for overlapping independent WebDriver calls (created by setup_selenium,
+            # shut down by cleanup)
+            self._executor = None
+            
+            # Background writer that persists screenshots off the hot path
+            # (started on demand and stopped by cleanup, so it never outlives the test)
+            self._screenshot_queue = queue.Queue()
+            self._screenshot_writer = None
             
             logger.info("Enhanced Web Testing Automation initialized successfully")
             
@@ -93,67 +578,30 @@ class EnhancedWebTestingAutomation:
     def setup_selenium(self, headless: bool = False) -> bool:
         """Set up Selenium WebDriver with enhanced options and error handling."""
         try:
-            chrome_options = Options()
-            if headless:
-                chrome_options.add_argument("--headless=new")  # Use new headless mode
-            
-            # Enhanced Chrome options for stability and speed
-            chrome_options.add_argument("--no-sandbox")
-            chrome_options.add_argument("--disable-dev-shm-usage")
-            chrome_options.add_argument("--disable-blink-features=AutomationControlled")
-            chrome_options.add_argument("--disable-extensions")
-            chrome_options.add_argument("--disable-gpu")
-            chrome_options.add_argument("--disable-web-security")
-            chrome_options.add_argument("--disable-features=TranslateUI")
-            chrome_options.add_argument("--disable-ipc-flooding-protection")
-            chrome_options.add_argument("--no-first-run")
-            chrome_options.add_argument("--no-service-autorun")
-            chrome_options.add_argument("--password-store=basic")
-            chrome_options.add_argument("--use-mock-keychain")
-            chrome_options.add_argument("--disable-background-networking")
-            chrome_options.add_argument("--disable-default-apps")
-            chrome_options.add_argument("--disable-sync")
-            chrome_options.add_argument("--metrics-recording-only")
-            chrome_options.add_argument("--no-default-browser-check")
-            chrome_options.add_argument("--no-pings")
-            chrome_options.add_argument("--disable-notifications")
-            
-            # Performance optimizations
-            chrome_options.add_argument("--aggressive-cache-discard")
-            chrome_options.add_argument("--memory-pressure-off")
-            
-            chrome_options.add_experimental_option("excludeSwitches", ["enable-automation", "enable-logging"])
-            chrome_options.add_experimental_option('useAutomationExtension', False)
-            
-            # Enhanced preferences
-            prefs = {
-                "credentials_enable_service": False,
-                "profile.password_manager_enabled": False,
-                "profile.default_content_setting_values.notifications": 2,
-                "profile.default_content_settings.popups": 0,
-                "profile.managed_default_content_settings.images": 1,  # Allow images for better analysis
-                "profile.default_content_setting_values.plugins": 1,
-                "profile.default_content_setting_values.geolocation": 2,
-                "profile.default_content_setting_values.media_stream": 2,
-                "profile.managed_default_content_settings.media_stream": 2
-            }
-            chrome_options.add_experimental_option("prefs", prefs)
+            chrome_options = _build_options(headless)
             
-            # Try different Chrome driver initialization methods
-            try:
-                if self.chrome_driver_path and os.path.exists(self.chrome_driver_path):
-                    service = Service(self.chrome_driver_path)
-                    self.driver = webdriver.Chrome(service=service, options=chrome_options)
-                else:
-                    # Try to use system Chrome driver
+            # Reuse a warm driver launched with the same options when available
+            self._driver_key = hash((frozenset(chrome_options.arguments), chrome_options.page_load_strategy))
+            self.driver = _driver_pool.acquire(self._driver_key)
+            if self.driver:
+                logger.info("Reusing pooled WebDriver instance")
+                
+            else:
+                # Try different Chrome driver initialization methods
+                try:
+                    if self.chrome_driver_path and os.path.exists(self.chrome_driver_path):
+                        service = Service(self.chrome_driver_path)
+                        self.driver = webdriver.Chrome(service=service, options=chrome_options)
+                    else:
+                        # Try to use system Chrome driver
+                        self.driver = webdriver.Chrome(options=chrome_options)
+                        
+                except Exception as e:
+                    logger.warning(f"Failed with Chrome driver path, trying system driver: {e}")
                     self.driver = webdriver.Chrome(options=chrome_options)
-                    
-            except Exception as e:
-                logger.warning(f"Failed with Chrome driver path, trying system driver: {e}")
-                self.driver = webdriver.Chrome(options=chrome_options)
             
             # Configure timeouts and window
-            self.driver.implicitly_wait(3)
+            self.driver.implicitly_wait(0)  # Explicit WebDriverWait only; implicit waits stall optional lookups
             self.driver.set_page_load_timeout(30)
             self.driver.set_script_timeout(15)
             self.driver.set_window_size(1366, 768)
@@ -161,6 +609,18 @@ class EnhancedWebTestingAutomation:
             # Create WebDriverWait instance
             self.wait = WebDriverWait(self.driver, 10)
             
+            if self._executor is None:
+                self._executor = ThreadPoolExecutor(max_workers=2, thread_name_prefix="webtest")
+            
+            # Block analytics and ad requests at the network layer; they only slow page loads.
+            # Images, fonts and CSS stay enabled unless requested, since screenshots are analyzed visually.
+            blocked_urls = BLOCKED_TRACKER_URLS + (BLOCKED_RESOURCE_URLS if self.block_resources else [])
+            try:
+                self.driver.execute_cdp_cmd("Network.enable", {})
+                self.driver.execute_cdp_cmd("Network.setBlockedURLs", {"urls": blocked_urls})
+            except Exception as e:
+                logger.warning(f"Could not enable request blocking: {e}")
+            
             # Add stealth properties
             self.driver.execute_script("Object.defineProperty(navigator, 'webdriver', {get: () => undefined})")
             
@@ -171,54 +631,113 @@ class EnhancedWebTestingAutomation:
             logger.error(f"Failed to initialize WebDriver: {e}")
             return False
     
-    def take_screenshot_optimized(self) -> str:
-        """Take an optimized screenshot with compression."""
+    def take_screenshot_optimized(self) -> tuple[Optional[str], str]:
+        """Take an optimized screenshot, returning (saved path or None, base64 for the API)."""
         try:
-            screenshot_path = self.screenshots_dir / f"screenshot_{self.screenshot_count:04d}.png"
-            
-            # Take screenshot
-            if not self.driver.save_screenshot(str(screenshot_path)):
-                logger.error("Failed to save screenshot")
-                return ""
-            
-            # Optimize image size for faster API calls
+            # Let Chromium scale and JPEG-encode the capture; CDP already returns base64
             try:
-                with Image.open(screenshot_path) as img:
-                    # Resize if too large
-                    if img.width > 1280 or img.height > 720:
-                        img.thumbnail((1280, 720), Image.Resampling.LANCZOS)
-                        img.save(screenshot_path, optimize=True, quality=85)
+                encoded = self._capture_jpeg_b64()
+                extension = "jpg"
             except Exception as e:
-                logger.warning(f"Image optimization failed: {e}")
+                logger.debug(f"CDP screenshot unavailable, falling back to PNG: {e}")
+                png_bytes = self.driver.get_screenshot_as_png()
+                encoded = None
+                extension = "png"
+            
+            # Persist a copy in the background when artifacts are wanted
+            screenshot_path = None
+            if self.save_screenshots:
+                screenshot_path = str(self.screenshots_dir / f"screenshot_{self.screenshot_count:04d}.{extension}")
+                image_bytes = base64.b64decode(encoded) if encoded else png_bytes
+                if self._screenshot_writer is None:
+                    self._screenshot_writer = threading.Thread(
+                        target=self._screenshot_writer_loop, name="screenshot-writer", daemon=True
+                    )
+                    self._screenshot_writer.start()
+                self._screenshot_queue.put((screenshot_path, image_bytes))
             
             self.screenshot_count += 1
-            logger.info(f"Screenshot saved: {screenshot_path}")
-            return str(screenshot_path)
+            return screenshot_path, encoded or self._encode_image_for_api(png_bytes)
             
         except Exception as e:
             logger.error(f"Failed to take screenshot: {e}")
-            return ""
+            return None, ""
     
-    def get_enhanced_page_info(self) -> Dict[str, Any]:
-        """Get comprehensive page information with error handling."""
-        try:
-            page_info = {
-                "url": self.driver.current_url,
-                "title": self.driver.title,
-                "page_source_length": len(self.driver.page_source),
-                "interactive_elements": [],
-                "page_status": "loaded"
+    def _capture_jpeg_b64(self, max_width: int = 1024, max_height: int = 576, quality: int = 70) -> str:
+        """Capture the viewport as a downscaled JPEG via CDP Page.captureScreenshot."""
+        viewport = self.driver.execute_cdp_cmd("Page.getLayoutMetrics", {})["cssLayoutViewport"]
+        width, height = viewport["clientWidth"], viewport["clientHeight"]
+        scale = min(1.0, max_width / width, max_height / height)
+        
+        result = self.driver.execute_cdp_cmd("Page.captureScreenshot", {
+            "format": "jpeg",
+            "quality": quality,
+            "captureBeyondViewport": False,
+            "clip": {
+                "x": viewport.get("pageX", 0),
+                "y": viewport.get("pageY", 0),
+                "width": width,
+                "height": height,
+                "scale": scale
             }
+        })
+        return result["data"]
+    
+    def take_screenshot_b64(self) -> str:
+        """Take a screenshot and return only its base64 encoding for the API."""
+        return self.take_screenshot_optimized()[1]
+    
+    def _screenshot_writer_loop(self):
+        """Write queued screenshots to disk until cleanup queues the None sentinel."""
+        while True:
+            item = self._screenshot_queue.get()
+            if item is None:
+                self._screenshot_queue.task_done()
+                return
             
-            # Check if page is still loading
+            screenshot_path, image_bytes = item
             try:
-                ready_state = self.driver.execute_script("return document.readyState")
-                page_info["ready_state"] = ready_state
-                if ready_state != "complete":
-                    page_info["page_status"] = "loading"
-            except:
-                pass
+                # Optimize image size before writing; already-small captures are written as-is
+                resized = False
+                try:
+                    from PIL import Image
+                    
+                    with Image.open(io.BytesIO(image_bytes)) as img:
+                        # Resize if too large
+                        if img.width > 1280 or img.height > 720:
+                            img.thumbnail((1280, 720), Image.Resampling.LANCZOS)
+                            img.save(screenshot_path, optimize=True)
+                            resized = True
+                except Exception as e:
+                    logger.warning(f"Image optimization failed: {e}")
+                
+                if not resized:
+                    with open(screenshot_path, 'wb') as f:
+                        f.write(image_bytes)
+                logger.info(f"Screenshot saved: {screenshot_path}")
+            except Exception as e:
+                logger.warning(f"Failed to save screenshot {screenshot_path}: {e}")
+            finally:
+                self._screenshot_queue.task_done()
+    
+    def _encode_image_for_api(self, image_bytes: bytes) -> str:
+        """Downscale and JPEG-compress an image, returning it base64-encoded for the API."""
+        try:
+            from PIL import Image
             
+            with Image.open(io.BytesIO(image_bytes)) as img:
+                img.thumbnail((1024, 576), Image.Resampling.LANCZOS)
+                buffer = io.BytesIO()
+                img.convert("RGB").save(buffer, format="JPEG", quality=70)
+                return base64.b64encode(buffer.getbuffer()).decode('ascii')
+        except Exception as e:
+            # Fall back to the original bytes; the MIME type is detected when sending
+            logger.warning(f"Image compression failed: {e}")
+            return base64.b64encode(image_bytes).decode('ascii')
+    
+    def get_enhanced_page_info(self) -> Dict[str, Any]:
+        """Get comprehensive page information with error handling."""
+        try:
             # Get interactive elements with better error handling
             selectors_map = {
                 "input": "input:not([type='hidden'])",
@@ -229,63 +748,28 @@ class EnhancedWebTestingAutomation:
                 "form": "form"
             }
             
-            for element_type, selector in selectors_map.items():
-                try:
-                    elements = self.driver.find_elements(By.CSS_SELECTOR, selector)[:8]  # Limit elements
-                    
-                    for i, elem in enumerate(elements):
-                        try:
-                            # Check if element is visible
-                            if not elem.is_displayed():
-                                continue
-                            
-                            elem_info = {
-                                "type": element_type,
-                                "index": i,
-                                "tag": elem.tag_name,
-                                "id": elem.get_attribute("id") or "",
-                                "class": elem.get_attribute("class") or "",
-                                "text": (elem.text or "").strip()[:100],
-                                "visible": elem.is_displayed(),
-                                "enabled": elem.is_enabled()
-                            }
-                            
-                            # Add specific attributes
-                            if element_type == "input":
-                                elem_info.update({
-                                    "input_type": elem.get_attribute("type") or "text",
-                                    "name": elem.get_attribute("name") or "",
-                                    "placeholder": elem.get_attribute("placeholder") or "",
-                                    "value": elem.get_attribute("value") or ""
-                                })
-                            elif element_type == "link":
-                                href = elem.get_attribute("href") or ""
-                                elem_info["href"] = href[:100]  # Truncate long URLs
-                            elif element_type == "form":
-                                elem_info.update({
-                                    "action": elem.get_attribute("action") or "",
-                                    "method": (elem.get_attribute("method") or "GET").upper()
-                                })
-                            elif element_type == "button":
-                                elem_info["onclick"] = elem.get_attribute("onclick") or ""
-                            
-                            page_info["interactive_elements"].append(elem_info)
-                            
-                        except Exception as e:
-                            logger.debug(f"Error processing element {i}: {e}")
-                            continue
-                            
-                except Exception as e:
-                    logger.debug(f"Error finding {element_type} elements: {e}")
-                    continue
+            # Collect everything in a single execute_script call instead of one
+            # WebDriver round-trip per element attribute
+            # Up to 8 visible elements per type are counted, but only the first 12 are returned
+            snapshot = self.driver.execute_script(_COLLECT_PAGE_INFO_JS, selectors_map, 8, 12)
             
-            # Get any error messages or alerts
-            try:
-                alerts = self.driver.find_elements(By.CSS_SELECTOR, ".alert, .error, .warning, [role='alert']")
-                if alerts:
-                    page_info["alerts"] = [alert.text.strip()[:200] for alert in alerts[:3] if alert.is_displayed()]
-            except:
-                pass
+            page_info = {
+                "url": snapshot["url"],
+                "title": snapshot["title"],
+                "interactive_elements": snapshot["interactive_elements"],
+                "interactive_count": snapshot["interactive_count"],
+                "page_status": "loaded" if snapshot["ready_state"] == "complete" else "loading",
+                "ready_state": snapshot["ready_state"]
+            }
+            
+            if snapshot["alerts"]:
+                page_info["alerts"] = snapshot["alerts"]
+            
+            self._remember_origin(snapshot["url"])
+            
+            if logger.isEnabledFor(logging.DEBUG):
+                for elem_info in page_info["interactive_elements"]:
+                    logger.debug(f"Found {elem_info['type']} element {elem_info['index']}: {elem_info['id'] or elem_info['tag']}")
             
             return page_info
             
@@ -295,32 +779,50 @@ class EnhancedWebTestingAutomation:
                 "url": getattr(self.driver, 'current_url', 'unknown'),
                 "title": "Error getting page info",
                 "interactive_elements": [],
+                "interactive_count": 0,
                 "error": str(e)
             }
     
+    def get_cached_page_info(self, state_hash: Optional[str] = None) -> Dict[str, Any]:
+        """Get page info for the current state, reusing the cached snapshot on revisits."""
+        if state_hash is None:
+            state_hash = self.get_page_state_hash()
+        
+        cached = self.page_state_cache.get(state_hash)
+        if cached is not None:
+            self.page_state_cache.move_to_end(state_hash)
+            logger.debug(f"Page info served from cache for state {state_hash}")
+            return cached
+        
+        page_info = self.get_enhanced_page_info()
+        page_info["state_hash"] = state_hash
+        
+        # Don't cache failed snapshots
+        if "error" not in page_info:
+            self.page_state_cache[state_hash] = page_info
+            if len(self.page_state_cache) > self.max_page_state_cache_size:
+                self.page_state_cache.popitem(last=False)
+        
+        return page_info
+    
+    def _remember_origin(self, url: str):
+        """Record the origin of a visited page so cleanup can clear its storage."""
+        parts = urlsplit(url)
+        if parts.scheme in ("http", "https") and parts.netloc:
+            self._visited_origins.add(f"{parts.scheme}://{parts.netloc}")
+    
     def get_page_state_hash(self) -> str:
-        """Generate a more comprehensive hash of the current page state."""
+        """Generate a hash of the current page state from its url, title, ready state, structure and alerts."""
         try:
-            url = self.driver.current_url
-            title = self.driver.title
+            # Element counts are only re-measured in the browser after a structural DOM change
+            dom_state = tuple(self.driver.execute_script(_PAGE_STATE_JS))
             
-            # Get content indicators
-            try:
-                content_length = len(self.driver.page_source)
-                forms_count = len(self.driver.find_elements(By.TAG_NAME, "form"))
-                inputs_count = len(self.driver.find_elements(By.CSS_SELECTOR, "input:not([type='hidden'])"))
-                buttons_count = len(self.driver.find_elements(By.CSS_SELECTOR, "button, input[type='button'], input[type='submit']"))
-                links_count = len(self.driver.find_elements(By.CSS_SELECTOR, "a[href]"))
-                
-                # Get page ready state
-                ready_state = self.driver.execute_script("return document.readyState")
-                
-                state_string = f"{url}|{title}|{content_length}|{forms_count}|{inputs_count}|{buttons_count}|{links_count}|{ready_state}"
-                return hashlib.md5(state_string.encode()).hexdigest()
-                
-            except Exception as e:
-                # Fallback hash
-                return hashlib.md5(f"{url}|{title}".encode()).hexdigest()
+            # Only rehash when the page changed since the last call
+            if dom_state != self._last_dom_state:
+                self._remember_origin(dom_state[0])
+                self._last_dom_hash = _fingerprint("|".join(map(str, dom_state)).encode())
+                self._last_dom_state = dom_state
+            return self._last_dom_hash
                 
         except Exception as e:
             logger.error(f"Error generating page hash: {e}")
@@ -328,173 +830,117 @@ class EnhancedWebTestingAutomation:
     
     def execute_javascript_enhanced(self, js_code: str) -> tuple[bool, str]:
         """Execute JavaScript with enhanced error handling and helper functions."""
+        success, result = self._run_javascript(js_code)
+        if success:
+            self.successful_actions += 1
+        else:
+            self.failed_actions += 1
+        return success, result
+    
+    def _run_javascript(self, js_code: str) -> tuple[bool, str]:
+        """Execute wrapped JavaScript and wait for the DOM to settle, without counting the action."""
         try:
-            # Enhanced JavaScript wrapper with more helper functions
-            enhanced_js = f"""
-            try {{
-                // Helper functions
-                function quickClick(selector) {{
-                    const elements = typeof selector === 'string' ? document.querySelectorAll(selector) : [selector];
-                    for (let el of elements) {{
-                        if (el && el.offsetParent !== null) {{ // Check if visible
-                            el.scrollIntoView({{behavior: 'smooth', block: 'center'}});
-                            setTimeout(() => {{
-                                el.click();
-                            }}, 100);
-                            return 'Clicked element: ' + (el.id || el.className || el.tagName);
-                        }}
-                    }}
-                    throw new Error('No visible element found for: ' + selector);
-                }}
-                
-                function quickFill(selector, value) {{
-                    const el = document.querySelector(selector);
-                    if (!el) throw new Error('Input not found: ' + selector);
-                    
-                    el.scrollIntoView({{behavior: 'smooth', block: 'center'}});
-                    el.focus();
-                    
-                    // Clear existing value
-                    el.value = '';
-                    
-                    // Set new value
-                    el.value = value;
-                    
-                    // Trigger events
-                    el.dispatchEvent(new Event('input', {{bubbles: true, cancelable: true}}));
-                    el.dispatchEvent(new Event('change', {{bubbles: true, cancelable: true}}));
-                    el.dispatchEvent(new Event('keyup', {{bubbles: true, cancelable: true}}));
-                    
-                    return 'Filled input: ' + (el.name || el.id || selector) + ' with: ' + value;
-                }}
-                
-                function quickSubmit(formSelector) {{
-                    const form = document.querySelector(formSelector);
-                    if (!form) throw new Error('Form not found: ' + formSelector);
-                    
-                    form.scrollIntoView({{behavior: 'smooth', block: 'center'}});
-                    
-                    // Try clicking submit button first
-                    const submitBtn = form.querySelector('button[type="submit"], input[type="submit"], button:not([type])');
-                    if (submitBtn && submitBtn.offsetParent !== null) {{
-                        submitBtn.click();
-                        return 'Submitted form by clicking submit button';
-                    }} else {{
-                        form.submit();
-                        return 'Submitted form directly';
-                    }}
-                }}
-                
-                function findElements(selector) {{
-                    const elements = document.querySelectorAll(selector);
-                    return Array.from(elements).map((el, i) => ({{
-                        index: i,
-                        tag: el.tagName,
-                        id: el.id,
-                        className: el.className,
-                        text: el.textContent.trim().substring(0, 100),
-                        visible: el.offsetParent !== null
-                    }}));
-                }}
-                
-                function scrollToElement(selector) {{
-                    const el = document.querySelector(selector);
-                    if (!el) throw new Error('Element not found: ' + selector);
-                    el.scrollIntoView({{behavior: 'smooth', block: 'center'}});
-                    return 'Scrolled to element: ' + selector;
-                }}
-                
-                function getCurrentInfo() {{
-                    return {{
-                        url: window.location.href,
-                        title: document.title,
-                        readyState: document.readyState,
-                        activeElement: document.activeElement ? {{
-                            tag: document.activeElement.tagName,
-                            id: document.activeElement.id,
-                            className: document.activeElement.className
-                        }} : null,
-                        hasPopups: !!(document.querySelector('.modal, .popup, .overlay, [role="dialog"]')),
-                        alerts: Array.from(document.querySelectorAll('.alert, .error, .warning, [role="alert"]')).map(el => el.textContent.trim())
-                    }};
-                }}
-                
-                function dismissPopups() {{
-                    const selectors = [
-                        '.modal .close, .popup .close, .overlay .close',
-                        '[role="dialog"] button[aria-label*="close"]',
-                        '.cookie-banner button, .cookies-accept, .accept-cookies',
-                        '.newsletter-popup .close, .newsletter-modal .close',
-                        '.modal-backdrop, .overlay-backdrop',
-                        'button[data-dismiss="modal"]'
-                    ];
-                    
-                    for (let selector of selectors) {{
-                        const elements = document.querySelectorAll(selector);
-                        for (let el of elements) {{
-                            if (el.offsetParent !== null) {{
-                                el.click();
-                                return 'Dismissed popup/modal';
-                            }}
-                        }}
-                    }}
-                    
-                    // Try ESC key
-                    document.dispatchEvent(new KeyboardEvent('keydown', {{key: 'Escape', keyCode: 27}}));
-                    return 'Attempted to dismiss popups with ESC';
-                }}
-                
-                // Execute user code
-                const result = (function() {{
-                    {js_code}
-                }})();
-                
-                return result || "JavaScript executed successfully";
-                
-            }} catch (error) {{
-                console.error('JavaScript execution error:', error);
-                return "Error: " + error.toString();
-            }}
-            """
+            # Wrap user code with the helper functions
+            enhanced_js = _wrap_javascript(js_code)
             
             # Execute with timeout
             result = self.driver.execute_script(enhanced_js)
             
             if isinstance(result, str) and result.startswith("Error:"):
                 logger.error(f"JavaScript execution error: {result}")
-                self.failed_actions += 1
                 return False, result
             else:
                 logger.info(f"JavaScript executed successfully: {str(result)[:100]}")
-                self.successful_actions += 1
                 
                 # Wait for any dynamic content to load
-                time.sleep(1.5)
+                self.wait_for_dom_settle()
                 
                 return True, str(result)
                 
         except Exception as e:
             error_msg = f"Error executing JavaScript: {str(e)}"
             logger.error(error_msg)
-            self.failed_actions += 1
             return False, error_msg
     
+    def execute_javascript_steps(self, steps: List[Any]) -> tuple[bool, str]:
+        """Execute a sequence of JavaScript actions, stopping at the first failure unless allowed to continue.
+        
+        The whole sequence counts as a single action towards the success rate.
+        """
+        results = []
+        all_succeeded = True
+        
+        for number, step in enumerate(steps[:MAX_JS_STEPS], 1):
+            if isinstance(step, dict):
+                js_code = step.get('javascript', '')
+                continue_on_error = bool(step.get('continue_on_error', False))
+            else:
+                js_code = str(step)
+                continue_on_error = False
+            
+            success, result = self._run_javascript(js_code)
+            results.append(f"Step {number}: {result}")
+            
+            if not success:
+                all_succeeded = False
+                if not continue_on_error:
+                    results.append(f"Stopped after step {number} of {len(steps)}")
+                    break
+        else:
+            if len(steps) > MAX_JS_STEPS:
+                results.append(f"Skipped steps {MAX_JS_STEPS + 1}..{len(steps)} (limit {MAX_JS_STEPS})")
+        
+        if all_succeeded:
+            self.successful_actions += 1
+        else:
+            self.failed_actions += 1
+        return all_succeeded, "\n".join(results)
+    
+    def wait_for_dom_settle(self, timeout: float = 1.5, quiet_period: float = 0.25) -> bool:
+        """Wait until the DOM mutation counter stops changing, up to timeout seconds."""
+        state = {"count": None, "changed_at": time.monotonic()}
+        
+        def settled(driver) -> bool:
+            try:
+                # -1 while a new document is loading, -2 once a navigation replaced the observed page
+                count = driver.execute_script(
+                    "return document.readyState === 'loading' ? -1 : "
+                    "(window.__mutCount === undefined ? -2 : window.__mutCount)"
+                )
+            except WebDriverException:
+                count = -1
+            
+            now = time.monotonic()
+            if count != state["count"] or count == -1:
+                state["count"] = count
+                state["changed_at"] = now
+                return False
+            return now - state["changed_at"] >= quiet_period
+        
+        try:
+            WebDriverWait(self.driver, timeout, poll_frequency=0.05).until(settled)
+            return True
+        except TimeoutException:
+            logger.debug(f"DOM still changing after {timeout}s")
+            return False
+    
     def wait_for_condition(self, condition: str = "page_load", duration: int = 3) -> tuple[bool, str]:
         """Enhanced wait with different conditions."""
         try:
             logger.info(f"Waiting for {condition} ({duration} seconds)...")
             
             if condition == "page_load":
-                # Wait for page to be ready
-                self.wait.until(lambda driver: driver.execute_script("return document.readyState") == "complete")
-                time.sleep(duration)
+                # Return as soon as the page is ready instead of sleeping for the full duration
+                WebDriverWait(self.driver, duration).until(
+                    lambda driver: driver.execute_script("return document.readyState") == "complete"
+                )
                 return True, f"Page loaded successfully"
                 
             elif condition == "element_change":
                 # Wait for DOM changes
-                initial_length = len(self.driver.find_elements(By.CSS_SELECTOR, "*"))
+                initial_length = self.driver.execute_script("return document.getElementsByTagName('*').length")
                 time.sleep(duration)
-                final_length = len(self.driver.find_elements(By.CSS_SELECTOR, "*"))
+                final_length = self.driver.execute_script("return document.getElementsByTagName('*').length")
                 
                 if abs(final_length - initial_length) > 5:
                     return True, f"Page content changed (elements: {initial_length} -> {final_length})"
@@ -510,16 +956,56 @@ class EnhancedWebTestingAutomation:
             logger.warning(f"Wait condition failed: {e}")
             return True, f"Wait completed with warning: {str(e)}"
     
+    def _wait_feedback(self, result: str) -> tuple[dict, Dict[str, Any]]:
+        """Build the feedback message after a wait, returning (message, page info)."""
+        # Start the screenshot while page state is collected
+        screenshot_future = self._executor.submit(self.take_screenshot_b64)
+        
+        # Get updated page state
+        page_info = self.get_cached_page_info()
+        
+        feedback_content = f"""Wait completed: {result}
+
+CURRENT PAGE STATE:
+- URL: {page_info['url']}
+- Title: {page_info['title']}
+- Ready State: {page_info.get('ready_state', 'unknown')}
+- Interactive Elements: {page_info['interactive_count']}
+
+Please provide the next action or end if task is complete."""
+        
+        message = {
+            'role': 'user',
+            'content': feedback_content,
+            'image': screenshot_future.result()
+        }
+        return message, page_info
+    
     def encode_image_base64(self, image_path: str) -> str:
-        """Encode image to base64 with error handling."""
+        """Encode image to base64 with error handling and caching."""
         try:
             if not os.path.exists(image_path):
                 logger.error(f"Image file not found: {image_path}")
                 return ""
+            
+            # Reuse the cached encoding if the file has not changed
+            stat = os.stat(image_path)
+            cache_key = (str(image_path), stat.st_size, stat.st_mtime_ns)
+            cached = self._b64_cache.get(cache_key)
+            if cached is not None:
+                self._b64_cache.move_to_end(cache_key)
+                logger.debug(f"Image encoding served from cache: {image_path}")
+                return cached[0]
                 
-            with open(image_path, 'rb') as image_file:
+            # Read the file in one pass through a large buffer
+            with open(image_path, 'rb', buffering=1 << 20) as image_file:
                 image_data = image_file.read()
-                encoded = base64.b64encode(image_data).decode('utf-8')
+            encoded = self._encode_image_for_api(image_data)
+            
+            digest = _fingerprint(encoded.encode())
+            self._b64_cache[cache_key] = (encoded, digest)
+            if len(self._b64_cache) > self.max_b64_cache_size:
+                self._b64_cache.popitem(last=False)
                 
             logger.debug(f"Image encoded successfully: {len(encoded)} characters")
             return encoded
@@ -528,70 +1014,129 @@ class EnhancedWebTestingAutomation:
             logger.error(f"Failed to encode image: {e}")
             return ""
     
+    def screenshot_hash(self, image_path: str) -> str:
+        """Return a hash of the base64-encoded screenshot, encoding it if needed."""
+        if not image_path or not self.encode_image_base64(image_path):
+            return ""
+        
+        stat = os.stat(image_path)
+        cached = self._b64_cache.get((str(image_path), stat.st_size, stat.st_mtime_ns))
+        return cached[1] if cached else ""
+    
+    def _build_api_content(self, messages: List[dict]) -> List[dict]:
+        """Convert conversation messages into Gemini content parts."""
+        content = []
+        
+        # The caller bounds the window: the task prompt plus the latest few turns
+        recent_messages = list(messages)
+        
+        # Only the most recent screenshot is sent; older ones are stale
+        latest_image_index = max(
+            (i for i, msg in enumerate(recent_messages) if msg['role'] == 'user' and msg.get('image')),
+            default=None
+        )
+        
+        for i, msg in enumerate(recent_messages):
+            if msg['role'] == 'user':
+                parts = [{'text': msg['content']}]
+                
+                if i == latest_image_index:
+                    parts.append({
+                        'inline_data': {
+                            'mime_type': 'image/png' if msg['image'].startswith('iVBOR') else 'image/jpeg',
+                            'data': msg['image']
+                        }
+                    })
+                
+                content.append({'parts': parts})
+        
+        return content
+    
+    def _get_retry_delay(self, error: Exception, attempt: int, max_retries: int) -> Optional[float]:
+        """Return the backoff delay before retrying after an API error, or None to give up."""
+        error_str = str(error).lower()
+        
+        if "quota" in error_str or "limit" in error_str:
+            logger.error(f"API quota/limit exceeded: {error}")
+            base_delay = 5
+        elif "503" in error_str or "unavailable" in error_str or "429" in error_str:
+            logger.warning(f"API temporarily unavailable (attempt {attempt + 1}): {error}")
+            base_delay = 3
+        else:
+            logger.error(f"API error (attempt {attempt + 1}): {error}")
+            base_delay = 2
+        
+        if attempt >= max_retries - 1:
+            return None
+        
+        # Exponential backoff with jitter so concurrent retries don't collide
+        backoff = min(base_delay * (2 ** attempt), 30)
+        return random.uniform(backoff / 2, backoff)
+    
+    def _get_content_cache_key(self, content: List[dict]) -> str:
+        """Hash the text and screenshot data of a request for response caching."""
+        hasher = hashlib.blake2b(digest_size=16)
+        for item in content:
+            for part in item['parts']:
+                if 'text' in part:
+                    hasher.update(part['text'].encode())
+                else:
+                    hasher.update(part['inline_data']['data'].encode())
+                hasher.update(b'\0')
+        return hasher.hexdigest()
+    
+    def _get_cached_response(self, cache_key: str) -> Optional[str]:
+        """Return a fresh cached model response for this request, if any."""
+        cached = self._vision_cache.get(cache_key)
+        if cached is None:
+            return None
+        
+        response_text, cached_at = cached
+        if time.monotonic() - cached_at > self.vision_cache_ttl:
+            del self._vision_cache[cache_key]
+            return None
+        
+        self._vision_cache.move_to_end(cache_key)
+        logger.info("Reusing cached AI response for identical page state")
+        return response_text
+    
+    def _cache_response(self, cache_key: str, response_text: str):
+        """Store a model response, evicting the least recently used entry when full."""
+        self._vision_cache[cache_key] = (response_text, time.monotonic())
+        if len(self._vision_cache) > self.max_vision_cache_size:
+            self._vision_cache.popitem(last=False)
+    
     def call_gemini_api_robust(self, messages: List[dict], max_retries: int = 3) -> str:
         """Robust Gemini API call with enhanced retry logic."""
+        # Prepare content efficiently
+        content = self._build_api_content(messages)
+        
+        # Identical screenshot and prompt get the same answer, skip the round-trip
+        cache_key = self._get_content_cache_key(content)
+        cached = self._get_cached_response(cache_key)
+        if cached is not None:
+            return cached
+        
         for attempt in range(max_retries):
             try:
-                # Prepare content efficiently
-                content = []
-                
-                # Use recent messages to avoid token limits
-                recent_messages = messages[-2:] if len(messages) > 2 else messages
-                
-                for msg in recent_messages:
-                    if msg['role'] == 'user':
-                        parts = [{'text': msg['content']}]
-                        
-                        if msg.get('image') and msg['image']:
-                            parts.append({
-                                'inline_data': {
-                                    'mime_type': 'image/png',
-                                    'data': msg['image']
-                                }
-                            })
-                        
-                        content.append({'parts': parts})
-                
                 # Generate content with retry
                 response = self.model.generate_content(
                     content,
-                    generation_config=genai.types.GenerationConfig(
-                        temperature=0.1,
-                        max_output_tokens=1500
-                    )
+                    generation_config=self.api_generation_config
                 )
                 
                 if response and response.text:
-                    return response.text.strip()
+                    response_text = response.text.strip()
+                    self._cache_response(cache_key, response_text)
+                    return response_text
                 else:
                     logger.warning(f"Empty response on attempt {attempt + 1}")
                     
             except Exception as e:
-                error_str = str(e).lower()
-                
-                if "quota" in error_str or "limit" in error_str:
-                    logger.error(f"API quota/limit exceeded: {e}")
-                    if attempt < max_retries - 1:
-                        time.sleep(5 * (attempt + 1))  # Exponential backoff
-                        continue
-                    else:
-                        raise
-                        
-                elif "503" in error_str or "unavailable" in error_str or "429" in error_str:
-                    logger.warning(f"API temporarily unavailable (attempt {attempt + 1}): {e}")
-                    if attempt < max_retries - 1:
-                        time.sleep(3 * (attempt + 1))
-                        continue
-                    else:
-                        raise
-                        
-                else:
-                    logger.error(f"API error (attempt {attempt + 1}): {e}")
-                    if attempt < max_retries - 1:
-                        time.sleep(2)
-                        continue
-                    else:
-                        raise
+                delay = self._get_retry_delay(e, attempt, max_retries)
+                if delay is None:
+                    raise
+                time.sleep(delay)
         
         return ""
     
@@ -620,7 +1165,7 @@ class EnhancedWebTestingAutomation:
                 return False, f"High failure rate: {failure_rate:.1%} ({self.failed_actions}/{total_actions})"
         
         # Check elapsed time
-        elapsed_time = time.time() - self.start_time
+        elapsed_time = time.monotonic() - self.start_time
         if elapsed_time > 300:  # 5 minutes max
             return False, f"Maximum time limit (5 minutes) reached"
         
@@ -631,44 +1176,46 @@ class EnhancedWebTestingAutomation:
         if not response_text:
             return {"action": "end", "error": "Empty response"}
         
-        # Try to extract JSON from response
-        json_patterns = [
-            r'```json\s*(\{.*?\})\s*```',
-            r'```\s*(\{.*?\})\s*```',
-            r'(\{[^{}]*"action"[^{}]*\})',
-            r'(\{.*?"action".*?\})'
-        ]
+        # Fast path: the whole response is a JSON object, optionally inside a code fence
+        try:
+            data = _json_loads(_FENCE_RE.sub('', response_text).strip())
+            if isinstance(data, dict) and 'action' in data:
+                return data
+        except json.JSONDecodeError:
+            pass
         
-        for pattern in json_patterns:
-            matches = re.findall(pattern, response_text, re.DOTALL | re.IGNORECASE)
-            for match in matches:
-                try:
-                    data = json.loads(match.strip())
-                    if 'action' in data:
-                        return data
-                except json.JSONDecodeError:
-                    continue
+        # Try to extract JSON from response: decode an object starting at each '{' in turn
+        start = response_text.find('{')
+        while start != -1:
+            try:
+                data, _ = _JSON_DECODER.raw_decode(response_text, start)
+                if isinstance(data, dict) and 'action' in data:
+                    return data
+            except json.JSONDecodeError:
+                pass
+            start = response_text.find('{', start + 1)
         
         # If no JSON found, try to parse text response
         response_lower = response_text.lower()
+        words = frozenset(_WORD_RE.findall(response_lower))
+        hints = frozenset(_HINT_RE.findall(response_lower))
         
         # Check for end conditions
-        end_keywords = ['complete', 'finished', 'done', 'success', 'found the', 'task accomplished', 'objective achieved']
-        if any(keyword in response_lower for keyword in end_keywords):
+        if words & END_KEYWORDS or hints & END_PHRASES:
             return {
                 "action": "end",
                 "analysis_report": response_text
             }
         
         # Check for JavaScript patterns
-        if 'click' in response_lower or 'fill' in response_lower or 'submit' in response_lower:
+        if words & JS_KEYWORDS or hints & JS_CALL_HINTS:
             # Try to extract JavaScript-like commands
             js_commands = []
             
             # Look for function calls
-            if 'click(' in response_lower:
+            if 'click(' in hints:
                 js_commands.append("quickClick('.btn, button, a, input[type=\"submit\"]')")
-            if 'fill(' in response_lower or 'type' in response_lower:
+            if 'fill(' in hints or 'type' in words:
                 js_commands.append("return findElements('input, textarea, select')")
             
             if js_commands:
@@ -678,7 +1225,7 @@ class EnhancedWebTestingAutomation:
                 }
         
         # Check for wait patterns
-        if 'wait' in response_lower or 'loading' in response_lower:
+        if words & WAIT_KEYWORDS:
             return {
                 "action": "wait",
                 "duration": 3
@@ -693,7 +1240,7 @@ class EnhancedWebTestingAutomation:
     def run_enhanced_test(self, initial_url: str, task_description: str, max_iterations: int = 12) -> str:
         """Run the automated web test with enhanced error handling and efficiency."""
         try:
-            self.start_time = time.time()
+            self.start_time = time.monotonic()
             logger.info(f"Starting enhanced test: {task_description}")
             logger.info(f"Target URL: {initial_url}")
             
@@ -703,8 +1250,13 @@ class EnhancedWebTestingAutomation:
                     logger.info(f"Navigating to {initial_url} (attempt {attempt + 1})")
                     self.driver.get(initial_url)
                     
-                    # Wait for initial page load
-                    self.wait_for_condition("page_load", 3)
+                    # With the eager load strategy the DOM is usable once it is interactive
+                    try:
+                        self.wait.until(
+                            lambda driver: driver.execute_script("return document.readyState") in ("interactive", "complete")
+                        )
+                    except TimeoutException:
+                        logger.warning("Timed out waiting for initial page to become interactive")
                     break
                     
                 except Exception as e:
@@ -713,70 +1265,113 @@ class EnhancedWebTestingAutomation:
                         return f"Failed to navigate to {initial_url} after 3 attempts: {str(e)}"
                     time.sleep(2)
             
-            # Take initial screenshot
-            screenshot_path = self.take_screenshot_optimized()
-            if not screenshot_path:
+            # Take initial screenshot while the initial page information is collected
+            screenshot_future = self._executor.submit(self.take_screenshot_b64)
+            page_info = self.get_cached_page_info()
+            screenshot_b64 = screenshot_future.result()
+            if not screenshot_b64:
                 logger.warning("Failed to take initial screenshot, continuing without it")
             
-            # Get initial page information
-            page_info = self.get_enhanced_page_info()
-            logger.info(f"Initial page loaded: {page_info['title']} ({len(page_info['interactive_elements'])} interactive elements)")
+            logger.info(f"Initial page loaded: {page_info['title']} ({page_info['interactive_count']} interactive elements)")
             
             # Initialize conversation
-            initial_content = f"""{SYSTEM_PROMPT}
-
-TASK: {task_description}
+            initial_content = f"""{_PROMPT_HEADER}{task_description}
 
 CURRENT PAGE ANALYSIS:
 - URL: {page_info['url']}
 - Title: {page_info['title']}
 - Status: {page_info.get('page_status', 'unknown')}
-- Interactive elements found: {len(page_info['interactive_elements'])}
+- Interactive elements found: {page_info['interactive_count']}
 
 KEY INTERACTIVE ELEMENTS:
-{json.dumps(page_info['interactive_elements'][:12], indent=1)}
+{_json_dumps(page_info['interactive_elements'])}
 
 Please analyze the page and provide the next action to complete the task efficiently. 
 Focus on the main objective and end the test when the goal is achieved."""
             
-            messages = [{
+            # The task prompt is kept outside the sliding window so it is never evicted
+            self.task_message = {
                 'role': 'user',
                 'content': initial_content,
-                'image': self.encode_image_base64(screenshot_path) if screenshot_path else ""
-            }]
+                'image': screenshot_b64
+            }
+            self.conversation_history.clear()
+            messages = self.conversation_history
             
             # Enhanced testing loop
             iteration = 0
             goal_achieved = False
-            test_results = []
+            test_results = deque(maxlen=max_iterations * 2)  # At most two entries per iteration
+            
+            # State hash computed while collecting the latest page info, reused at the next check
+            known_state_hash = page_info.get('state_hash')
+            last_action = None
+            task_hash = _fingerprint(task_description.encode())
+            decision_key = None
             
             while iteration < max_iterations and not goal_achieved:
                 iteration += 1
                 logger.info(f"=== Iteration {iteration}/{max_iterations} ===")
                 
                 # Check if we should continue testing
-                current_state_hash = self.get_page_state_hash()
+                current_state_hash = known_state_hash or self.get_page_state_hash()
+                known_state_hash = None
+                screenshot_future = None
                 should_continue, continue_reason = self.should_continue_testing(current_state_hash, iteration, max_iterations)
                 
                 if not should_continue:
                     logger.info(f"Stopping test: {continue_reason}")
                     break
                 
-                try:
-                    # Get AI response with enhanced error handling
-                    logger.info("Getting AI response...")
-                    response_text = self.call_gemini_api_robust(messages)
+                # Forget a decision that left the page unchanged so a revisit asks the AI again
+                if decision_key is not None and decision_key[0] == current_state_hash:
+                    self._decision_cache.pop(decision_key, None)
+                decision_key = (current_state_hash, task_hash)
+                
+                # A wait that left the page unchanged would only be answered with another wait;
+                # wait once more locally instead of spending an AI call on the same state
+                if last_action == 'wait' and self.consecutive_same_state_count >= 1:
+                    success, result = self.wait_for_condition('element_change', 2)
                     
-                    if not response_text:
-                        logger.error("Empty response from AI")
-                        test_results.append(f"Iteration {iteration}: Empty AI response")
-                        continue
+                    # Report the fresh page state so the next AI call does not decide on a stale page
+                    feedback, page_info = self._wait_feedback(result)
+                    known_state_hash = page_info.get('state_hash')
+                    messages.append(feedback)
+                    
+                    test_results.append(f"Iteration {iteration}: WAIT (no AI call) - {result}")
+                    continue
+                
+                try:
+                    # Known page state for this task: reuse the earlier decision without an AI call.
+                    # A decision is replayed at most once, so a cycle between states cannot loop on it.
+                    response_data = self._decision_cache.pop(decision_key, None)
+                    if response_data is not None:
+                        logger.info("Reusing cached AI decision for this page state")
+                        response_text = _json_dumps(response_data)
+                        
+                    else:
+                        # Get AI response with enhanced error handling
+                        logger.info("Getting AI response...")
+                        response_text = self.call_gemini_api_robust([self.task_message, *messages])
+                        
+                        if not response_text:
+                            logger.error("Empty response from AI")
+                            test_results.append(f"Iteration {iteration}: Empty AI response")
+                            continue
+                        
+                        # Parse AI response
+                        response_data = self.parse_ai_response(response_text)
+                        
+                        # Only actions that act on the page are worth replaying; 'end' finishes the run
+                        if response_data.get('action') in ('javascript', 'wait'):
+                            self._decision_cache[decision_key] = response_data
+                            if len(self._decision_cache) > self.max_decision_cache_size:
+                                self._decision_cache.popitem(last=False)
                     
-                    # Parse AI response
-                    response_data = self.parse_ai_response(response_text)
                     action = response_data.get('action', 'unknown')
                     
                     logger.info(f"AI Action: {action}")
+                    last_action = action
                     test_results.append(f"Iteration {iteration}: Action = {action}")
                     
                     # Handle different actions
@@ -787,7 +1382,7 @@ Focus on the main objective and end the test when the goal is achieved."""
                         analysis_report = response_data.get('analysis_report', response_text)
                         
                         # Get final page info for complete report
-                        final_page_info = self.get_enhanced_page_info()
+                        final_page_info = self.get_cached_page_info(current_state_hash)
                         
                         final_report = f"""
 === ENHANCED WEB TESTING AUTOMATION REPORT ===
@@ -795,13 +1390,13 @@ Focus on the main objective and end the test when the goal is achieved."""
 TASK: {task_description}
 STATUS: COMPLETED BY AI
 TOTAL ITERATIONS: {iteration}
-EXECUTION TIME: {time.time() - self.start_time:.1f} seconds
+EXECUTION TIME: {time.monotonic() - self.start_time:.1f} seconds
 SUCCESS RATE: {self.successful_actions}/{self.successful_actions + self.failed_actions} actions successful
 
 FINAL PAGE STATE:
 - URL: {final_page_info['url']}
 - Title: {final_page_info['title']}
-- Interactive Elements: {len(final_page_info['interactive_elements'])}
+- Interactive Elements: {final_page_info['interactive_count']}
 
 AI ANALYSIS:
 {analysis_report}
@@ -816,7 +1411,10 @@ SCREENSHOTS SAVED: {self.screenshot_count} files in {self.screenshots_dir}
                     
                     elif action == 'javascript':
                         js_code = response_data.get('javascript', '')
-                        if not js_code:
+                        steps = response_data.get('steps')
+                        if not isinstance(steps, list):
+                            steps = None
+                        if not js_code and not steps:
                             logger.warning("No JavaScript code provided")
                             messages.append({
                                 'role': 'user',
@@ -824,15 +1422,20 @@ SCREENSHOTS SAVED: {self.screenshot_count} files in {self.screenshots_dir}
                             })
                             continue
                         
-                        logger.info(f"Executing JavaScript: {js_code[:100]}...")
-                        success, result = self.execute_javascript_enhanced(js_code)
+                        # Screenshot and page info are collected once, after the last step
+                        if steps:
+                            logger.info(f"Executing {len(steps)} JavaScript steps...")
+                            success, result = self.execute_javascript_steps(steps)
+                        else:
+                            logger.info(f"Executing JavaScript: {js_code[:100]}...")
+                            success, result = self.execute_javascript_enhanced(js_code)
                         
-                        # Take screenshot after action
-                        screenshot_path = self.take_screenshot_optimized()
+                        # Take screenshot and collect page info concurrently after action
+                        screenshot_future = self._executor.submit(self.take_screenshot_b64)
+                        page_info = self.get_cached_page_info()
+                        known_state_hash = page_info.get('state_hash')
                         
                         if success:
-                            # Get updated page info
-                            page_info = self.get_enhanced_page_info()
                             
                             feedback_content = f"""JavaScript executed successfully!
 
@@ -841,10 +1444,10 @@ RESULT: {result}
 UPDATED PAGE STATE:
 - URL: {page_info['url']}
 - Title: {page_info['title']}
-- Interactive Elements: {len(page_info['interactive_elements'])}
+- Interactive Elements: {page_info['interactive_count']}
 - Alerts/Messages: {page_info.get('alerts', [])}
 
-Current page has {len(page_info['interactive_elements'])} interactive elements.
+Current page has {page_info['interactive_count']} interactive elements.
 
 Please continue with the next action or end if the task is complete."""
                             
@@ -866,7 +1469,7 @@ Current page: {self.driver.current_url}"""
                         messages.append({
                             'role': 'user',
                             'content': feedback_content,
-                            'image': self.encode_image_base64(screenshot_path) if screenshot_path else ""
+                            'image': screenshot_future.result()
                         })
                     
                     elif action == 'wait':
@@ -878,27 +1481,9 @@ Current page: {self.driver.current_url}"""
                         
                         success, result = self.wait_for_condition(condition, duration)
                         
-                        # Take screenshot after wait
-                        screenshot_path = self.take_screenshot_optimized()
-                        
-                        # Get updated page state
-                        page_info = self.get_enhanced_page_info()
-                        
-                        feedback_content = f"""Wait completed: {result}
-
-CURRENT PAGE STATE:
-- URL: {page_info['url']}
-- Title: {page_info['title']}
-- Ready State: {page_info.get('ready_state', 'unknown')}
-- Interactive Elements: {len(page_info['interactive_elements'])}
-
-Please provide the next action or end if task is complete."""
-                        
-                        messages.append({
-                            'role': 'user',
-                            'content': feedback_content,
-                            'image': self.encode_image_base64(screenshot_path) if screenshot_path else ""
-                        })
+                        feedback, page_info = self._wait_feedback(result)
+                        known_state_hash = page_info.get('state_hash')
+                        messages.append(feedback)
                         
                         test_results.append(f"Iteration {iteration}: WAIT - {result}")
                     
@@ -913,8 +1498,8 @@ Please provide the next action or end if task is complete."""
                 except Exception as e:
                     logger.error(f"Error in iteration {iteration}: {e}")
                     
-                    # Take screenshot for debugging
-                    screenshot_path = self.take_screenshot_optimized()
+                    # Take screenshot for debugging, reusing the one already captured this iteration
+                    screenshot_b64 = screenshot_future.result() if screenshot_future else self.take_screenshot_b64()
                     
                     error_feedback = f"""Error occurred in iteration {iteration}: {str(e)}
 
@@ -925,7 +1510,7 @@ Please try a different approach or end the test if the main objective has been a
                     messages.append({
                         'role': 'user',
                         'content': error_feedback,
-                        'image': self.encode_image_base64(screenshot_path) if screenshot_path else ""
+                        'image': screenshot_b64
                     })
                     
                     test_results.append(f"Iteration {iteration}: ERROR - {str(e)[:50]}")
@@ -937,9 +1522,10 @@ Please try a different approach or end the test if the main objective has been a
             if not goal_achieved:
                 logger.info("Test completed - generating final report...")
                 
-                # Get final page state
-                final_page_info = self.get_enhanced_page_info()
-                final_screenshot = self.take_screenshot_optimized()
+                # Get final page state and screenshot concurrently
+                screenshot_future = self._executor.submit(self.take_screenshot_b64)
+                final_page_info = self.get_cached_page_info()
+                final_screenshot = screenshot_future.result()
                 
                 # Try to get final analysis from AI
                 final_analysis = "Test completed due to iteration/time limits."
@@ -950,10 +1536,10 @@ Please try a different approach or end the test if the main objective has been a
 
 Current page: {final_page_info['url']}
 Title: {final_page_info['title']}
-Interactive elements: {len(final_page_info['interactive_elements'])}
+Interactive elements: {final_page_info['interactive_count']}
 
 Was the task completed successfully? What was achieved?""",
-                        'image': self.encode_image_base64(final_screenshot) if final_screenshot else ""
+                        'image': final_screenshot
                     }], max_retries=1)
                     
                     if final_response:
@@ -969,7 +1555,7 @@ Was the task completed successfully? What was achieved?""",
 TASK: {task_description}
 STATUS: COMPLETED ({continue_reason if 'continue_reason' in locals() else 'Loop ended'})
 TOTAL ITERATIONS: {iteration}
-EXECUTION TIME: {time.time() - self.start_time:.1f} seconds
+EXECUTION TIME: {time.monotonic() - self.start_time:.1f} seconds
 SUCCESS RATE: {self.successful_actions}/{self.successful_actions + self.failed_actions if self.successful_actions + self.failed_actions > 0 else 1} actions successful
 
 INITIAL PAGE: {initial_url}
@@ -1003,7 +1589,7 @@ SCREENSHOTS DIRECTORY: {self.screenshots_dir}
 TASK: {task_description}
 STATUS: FAILED
 ERROR: {str(e)}
-EXECUTION TIME: {time.time() - self.start_time:.1f} seconds
+EXECUTION TIME: {time.monotonic() - self.start_time:.1f} seconds
 
 CURRENT STATE:
 - URL: {getattr(self.driver, 'current_url', 'unknown') if self.driver else 'Driver not initialized'}
@@ -1027,22 +1613,52 @@ PARTIAL RESULTS:
         """Enhanced cleanup with better error handling."""
         logger.info("Starting cleanup...")
         
+        # Release the worker threads; they reference this instance
+        if self._executor is not None:
+            self._executor.shutdown(wait=True)
+            self._executor = None
+        
+        # Make sure queued screenshots are on disk before reporting, then stop the writer;
+        # the thread references this instance and would otherwise keep it alive
+        self._screenshot_queue.join()
+        if self._screenshot_writer is not None:
+            self._screenshot_queue.put(None)
+            self._screenshot_writer.join()
+            self._screenshot_writer = None
+        
         try:
             if self.driver:
-                # Try to close all windows
+                # Reset the browser and return it to the pool instead of quitting
                 try:
-                    for handle in self.driver.window_handles:
+                    # Cookies for every domain, not just the current document's as delete_all_cookies does
+                    self.driver.execute_cdp_cmd("Network.clearBrowserCookies", {})
+                    for origin in self._visited_origins:
+                        self.driver.execute_cdp_cmd("Storage.clearDataForOrigin", {
+                            "origin": origin,
+                            "storageTypes": "local_storage,indexeddb,websql,cache_storage,service_workers"
+                        })
+                    self._visited_origins.clear()
+                    
+                    # sessionStorage belongs to the tab, so continue in a fresh one and close the rest
+                    old_handles = self.driver.window_handles
+                    self.driver.switch_to.new_window("tab")
+                    fresh_handle = self.driver.current_window_handle
+                    for handle in old_handles:
                         self.driver.switch_to.window(handle)
                         self.driver.close()
-                except:
-                    pass
-                
-                # Quit the driver
-                try:
-                    self.driver.quit()
-                    logger.info("WebDriver closed successfully")
+                    self.driver.switch_to.window(fresh_handle)
+                    
+                    self.driver.execute_cdp_cmd("Network.clearBrowserCache", {})
+                    _driver_pool.release(self.driver, self._driver_key)
+                    logger.info("WebDriver returned to pool")
+                    
                 except Exception as e:
-                    logger.warning(f"Error closing WebDriver: {e}")
+                    logger.warning(f"Could not reset WebDriver for reuse, quitting it: {e}")
+                    try:
+                        self.driver.quit()
+                        logger.info("WebDriver closed successfully")
+                    except Exception as e:
+                        logger.warning(f"Error closing WebDriver: {e}")
                     
         except Exception as e:
             logger.error(f"Error during cleanup: {e}")
@@ -1053,6 +1669,62 @@ PARTIAL RESULTS:
         
         logger.info("Cleanup completed")
 
+def shutdown_pool():
+    """Quit all pooled WebDriver instances."""
+    _driver_pool.shutdown()
+    logger.info("WebDriver pool shut down")
+
+atexit.register(shutdown_pool)
+
+def _run_single_test(gemini_api_key: str, index: int, url: str, task: str,
+                     headless: bool, max_iterations: int) -> str:
+    """Run one test in its own automation instance and screenshot subdirectory."""
+    automation = EnhancedWebTestingAutomation(
+        gemini_api_key=gemini_api_key,
+        screenshots_dir=f"test_screenshots/test_{index:02d}"
+    )
+    if not automation.setup_selenium(headless=headless):
+        return f"Failed to setup browser for test {index}: {url}"
+    return automation.run_enhanced_test(url, task, max_iterations)
+
+def _run_single_test_in_process(*args) -> str:
+    """Process pool entry point; pooled drivers are quit because worker processes skip atexit."""
+    try:
+        return _run_single_test(*args)
+    finally:
+        shutdown_pool()
+
+def run_tests_parallel(gemini_api_key: str, tests: List[tuple[str, str]], max_workers: int = 3,
+                       headless: bool = True, max_iterations: int = 12) -> List[str]:
+    """Run independent (url, task) tests concurrently, one browser per worker.
+    
+    Each test gets its own automation instance and screenshot subdirectory so
+    screenshot numbering doesn't collide. Reports are returned in input order.
+    """
+    with ThreadPoolExecutor(max_workers=max_workers, thread_name_prefix="webtest-worker") as executor:
+        futures = [
+            executor.submit(_run_single_test, gemini_api_key, i, url, task, headless, max_iterations)
+            for i, (url, task) in enumerate(tests)
+        ]
+        return [future.result() for future in futures]
+
+def run_batch(gemini_api_key: str, tests: List[tuple[str, str]], max_concurrency: int = 5,
+              headless: bool = True, max_iterations: int = 12) -> List[str]:
+    """Run independent (url, task) tests in separate worker processes.
+    
+    Unlike run_tests_parallel, every test gets its own interpreter, so CPU work
+    (image encoding, response parsing) doesn't contend for the GIL. Workers are
+    started with "spawn" since forking a process that already runs threads is
+    unsafe. Callers must invoke this under ``if __name__ == "__main__":``.
+    """
+    context = multiprocessing.get_context("spawn")
+    with ProcessPoolExecutor(max_workers=max_concurrency, mp_context=context) as executor:
+        futures = [
+            executor.submit(_run_single_test_in_process, gemini_api_key, i, url, task, headless, max_iterations)
+            for i, (url, task) in enumerate(tests)
+        ]
+        return [future.result() for future in futures]
+
 def main():
     """Enhanced main function with better error handling and user feedback."""
     try:
@@ -1091,9 +1763,9 @@ def main():
         print("\n🤖 Starting automated test execution...\n")
         
         # Run the enhanced test
-        start_time = time.time()
+        start_time = time.monotonic()
         report = automation.run_enhanced_test(initial_url, task_description, max_iterations)
-        execution_time = time.time() - start_time
+        execution_time = time.monotonic() - start_time
         
         # Display results
         print("\n" + "=" * 80)